@@ -0,0 +1,130 @@
+"""
+Response cache for the Alumnx MCP Server RAG tools
+
+"""
+
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import orjson
+import redis.asyncio as aioredis
+
+logger = logging.getLogger("mcp.cache")
+
+
+class TTLCache:
+    """
+    In-process LRU cache. Entries are fresh for ttl seconds after insertion,
+    then kept as stale for a further stale_ttl seconds so callers can fall
+    back to an old answer when the upstream is unavailable.
+    """
+
+    def __init__(self, maxsize: int = 500, ttl: float = 3600, stale_ttl: float = 0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data: "OrderedDict[str, Tuple[float, float, Any]]" = OrderedDict()
+
+    def _lookup(self, key: str, allow_stale: bool) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        fresh_until, stale_until, value = entry
+        now = time.monotonic()
+        if stale_until < now:
+            del self._data[key]
+            return None
+        if fresh_until < now and not allow_stale:
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._lookup(key, allow_stale=False)
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """Return the entry even if past its ttl, as long as it is within stale_ttl."""
+        return self._lookup(key, allow_stale=True)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value; ttl overrides the cache-wide ttl for this entry."""
+        fresh_until = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (fresh_until, fresh_until + self.stale_ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+class RedisCache:
+    """
+    Cache shared by every worker process through Redis, consulted after the
+    in-process TTLCache misses. Values are stored orjson-encoded and expire
+    after ttl seconds, so hits survive restarts and deploys.
+
+    With no url the cache is disabled and every get misses. Redis errors are
+    logged and treated as misses; the shared cache never fails a request.
+    """
+
+    def __init__(
+        self, url: str = "", ttl: float = 3600, timeout: float = 0.5,
+        prefix: str = "agrigpt:rag:"
+    ):
+        self.url = url
+        self.ttl = max(1, int(ttl))
+        self.timeout = timeout
+        self.prefix = prefix
+        self._client: Optional[aioredis.Redis] = None
+
+    def start(self) -> None:
+        if not self.url:
+            return
+        # A slow Redis should cost a cache miss, not the request's latency budget
+        self._client = aioredis.from_url(
+            self.url,
+            socket_timeout=self.timeout,
+            socket_connect_timeout=self.timeout,
+        )
+
+    async def stop(self) -> None:
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+
+    async def get(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """
+        Return (value, seconds until it expires in Redis), or None on a miss.
+        The remaining time is None if Redis reports no expiry.
+        """
+        if self._client is None:
+            return None
+        key = self.prefix + key
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                raw, pttl = await pipe.get(key).pttl(key).execute()
+            if raw is None:
+                return None
+            return orjson.loads(raw), (pttl / 1000 if pttl > 0 else None)
+        except (aioredis.RedisError, orjson.JSONDecodeError) as e:
+            logger.warning("Redis cache read failed: %s", e)
+            return None
+
+    async def set(self, key: str, value: Any) -> None:
+        if self._client is None:
+            return
+        try:
+            await self._client.setex(self.prefix + key, self.ttl, orjson.dumps(value))
+        except aioredis.RedisError as e:
+            logger.warning("Redis cache write failed: %s", e)
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Stable key for a tool call: SHA-256 over the normalized (stripped,
+    lower-cased) arguments, so it is the same across processes and restarts.
+    """
+    normalized = [str(part).strip().lower() for part in parts]
+    return hashlib.sha256(orjson.dumps(normalized)).hexdigest()
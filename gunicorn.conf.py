@@ -0,0 +1,32 @@
+"""
+Gunicorn config for running the Alumnx MCP Server in production
+
+    gunicorn mcp_server:app -c gunicorn.conf.py
+
+"""
+
+import multiprocessing
+import os
+
+
+bind = os.getenv("BIND", "0.0.0.0:9000")
+
+# One uvicorn worker per core; each worker runs its own FastAPI lifespan,
+# so the pooled httpx client is created after fork, never shared.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# uvicorn.workers is deprecated; the worker class now ships as uvicorn-worker
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Workers only start heartbeating once the lifespan has loaded the embedding
+# model, which can take well over gunicorn's 30s default on a cold start
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+keepalive = 5
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live metric files from the multiprocess dir
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,20 +1,36 @@
 #!/usr/bin/env python3
 """
-Alumnx MCP Server which has 3 Tools uses Streamable HTTP method
+Alumnx MCP Server which has 4 Tools uses Streamable HTTP method
 
 """
 
 import os
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+import time
+import random
+import hashlib
+import asyncio
+import contextlib
+import anyio
 import uvicorn
 import httpx
-from typing import Dict, Any
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import orjson
+import msgspec
+from contextlib import asynccontextmanager
+from typing import Annotated, Dict, Any, List, Optional, Tuple
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from fastmcp import FastMCP
-import uvicorn
+from pydantic import Field
+from prometheus_client import CollectorRegistry, Histogram, make_asgi_app, multiprocess
 from dotenv import load_dotenv
 from pinecone import Pinecone
-from sentence_transformers import SentenceTransformer
+
+from cache import RedisCache, TTLCache, make_key
 
 
 # ============================================================================
@@ -26,10 +42,39 @@ load_dotenv()
 PESTS_DISEASES_RAG_URL = os.getenv("PESTS_DISEASES_RAG_URL")
 GOVT_SCHEMES_RAG_URL = os.getenv("GOVT_SCHEMES_RAG_URL")
 RAG_TIMEOUT = int(os.getenv("RAG_TIMEOUT", "30"))
+RAG_CONNECT_TIMEOUT = float(os.getenv("RAG_CONNECT_TIMEOUT", "3"))
+RAG_READ_TIMEOUT = float(os.getenv("RAG_READ_TIMEOUT", str(RAG_TIMEOUT)))
+RAG_WRITE_TIMEOUT = float(os.getenv("RAG_WRITE_TIMEOUT", "5"))
+RAG_POOL_TIMEOUT = float(os.getenv("RAG_POOL_TIMEOUT", "2"))
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "200"))
+
+RAG_BATCHING = os.getenv("RAG_BATCHING", "false").lower() in ("1", "true", "yes")
+RAG_BATCH_MAX_SIZE = int(os.getenv("RAG_BATCH_MAX_SIZE", "8"))
+RAG_BATCH_MAX_WAIT_MS = int(os.getenv("RAG_BATCH_MAX_WAIT_MS", "20"))
+
+RAG_BULKHEAD_SIZE = int(os.getenv("RAG_BULKHEAD_SIZE", "20"))
+RAG_BULKHEAD_TIMEOUT = float(os.getenv("RAG_BULKHEAD_TIMEOUT", "5"))
+
+RAG_BREAKER_THRESHOLD = int(os.getenv("RAG_BREAKER_THRESHOLD", "5"))
+RAG_BREAKER_RECOVERY = float(os.getenv("RAG_BREAKER_RECOVERY", "30"))
+
+RAG_CACHE_MAXSIZE = int(os.getenv("RAG_CACHE_MAXSIZE", "500"))
+RAG_CACHE_TTL = float(os.getenv("RAG_CACHE_TTL", "3600"))
+RAG_CACHE_STALE_TTL = float(os.getenv("RAG_CACHE_STALE_TTL", "86400"))
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT", "0.5"))
+
+RAG_HTTP2 = os.getenv("RAG_HTTP2", "true").lower() in ("1", "true", "yes")
+RAG_MAX_CONNECTIONS = int(os.getenv("RAG_MAX_CONNECTIONS", "128"))
+RAG_MAX_KEEPALIVE = int(os.getenv("RAG_MAX_KEEPALIVE", "64"))
+RAG_KEEPALIVE_EXPIRY = float(os.getenv("RAG_KEEPALIVE_EXPIRY", "30"))
 
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 PINECONE_INDEX = os.getenv("PINECONE_INDEX")
 
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 # Validate required environment variables
 required_vars = {
     "PESTS_DISEASES_RAG_URL": PESTS_DISEASES_RAG_URL,
@@ -43,90 +88,688 @@ if missing:
     raise RuntimeError(f"Missing required environment variables: {missing}")
 
 
+# ============================================================================
+# LOGGING
+# ============================================================================
+
+# Request handlers only enqueue records; a listener thread does the blocking
+# stream writes so logging never stalls the event loop.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+)
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_log_handler = logging.handlers.QueueHandler(_log_queue)
+# QueueHandler pre-formats the message; keep it bare so the stream
+# formatter above is the only one that adds level and logger name
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+# LOG_LEVEL applies to this server's loggers only; third-party libraries
+# stay at WARNING so httpx does not log a line per upstream request
+logging.basicConfig(level=logging.WARNING, handlers=[_log_handler])
+logger = logging.getLogger("mcp")
+logger.setLevel(LOG_LEVEL)
+
+
+# ============================================================================
+# UPSTREAM HTTP
+# ============================================================================
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+class RagAnswer(msgspec.Struct):
+    answer: Any = None
+    sources: Optional[List[Any]] = []
+
+
+class RagBatchAnswer(msgspec.Struct):
+    results: List[RagAnswer]
+
+
+# Typed decoders parse and validate upstream replies in a single pass and
+# skip any fields we do not use
+_rag_answer_decoder = msgspec.json.Decoder(RagAnswer)
+_rag_batch_decoder = msgspec.json.Decoder(RagBatchAnswer)
+
+
+# Transient failures worth another attempt: timeouts, dropped connections,
+# rate limiting and server-side errors. Other 4xx responses mean bad input
+# and fail fast. Failed connects are retried by the transport alone
+# (RAG_CONNECT_RETRIES); retrying them here as well would multiply the
+# attempts against a dead backend.
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+TRANSPORT_RETRIED_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+RAG_MAX_RETRIES = 2
+RAG_CONNECT_RETRIES = 2
+RAG_RETRY_BACKOFF = 0.5
+RAG_RETRY_MAX_DELAY = 8.0
+
+RAG_LATENCY = Histogram(
+    "rag_latency_seconds",
+    "Latency of individual RAG backend HTTP calls",
+    ["backend", "status"],
+)
+
+
+# Backends whose negotiated protocol (HTTP/1.1 vs HTTP/2) has been logged
+_negotiated_backends: set = set()
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    # Honour a numeric Retry-After from the backend, otherwise exponential
+    # backoff with full jitter so retrying callers do not arrive in lockstep
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), RAG_RETRY_MAX_DELAY)
+    return random.uniform(0, min(RAG_RETRY_BACKOFF * 2 ** attempt, RAG_RETRY_MAX_DELAY))
+
+
+async def post_json(
+    client: httpx.AsyncClient, url: httpx.URL, payload: dict, backend: str
+) -> httpx.Response:
+    body = orjson.dumps(payload)
+    for attempt in range(RAG_MAX_RETRIES + 1):
+        started = time.perf_counter()
+        try:
+            response = await client.post(url, content=body, headers=_JSON_HEADERS)
+        except httpx.HTTPError as e:
+            RAG_LATENCY.labels(backend, "exception").observe(time.perf_counter() - started)
+            if (
+                not isinstance(e, RETRYABLE_ERRORS)
+                or isinstance(e, TRANSPORT_RETRIED_ERRORS)
+                or attempt == RAG_MAX_RETRIES
+            ):
+                raise
+            logger.warning(
+                "%s RAG call failed with %s, retrying (%d/%d)",
+                backend, type(e).__name__, attempt + 1, RAG_MAX_RETRIES
+            )
+            await asyncio.sleep(_retry_delay(attempt))
+            continue
+
+        RAG_LATENCY.labels(backend, str(response.status_code)).observe(
+            time.perf_counter() - started
+        )
+        if backend not in _negotiated_backends:
+            _negotiated_backends.add(backend)
+            logger.debug("%s RAG negotiated %s", backend, response.http_version)
+
+        if response.status_code in RETRYABLE_STATUS and attempt < RAG_MAX_RETRIES:
+            logger.warning(
+                "%s RAG returned HTTP %d, retrying (%d/%d)",
+                backend, response.status_code, attempt + 1, RAG_MAX_RETRIES
+            )
+            await asyncio.sleep(_retry_delay(attempt, response.headers.get("retry-after")))
+            continue
+        return response
+
+
+# ============================================================================
+# CIRCUIT BREAKER
+# ============================================================================
+
+class CircuitBreaker:
+    """
+    Fails fast while a backend is down instead of letting every request sit
+    out its full timeout.
+
+    CLOSED: calls flow; fail_threshold consecutive failures open the circuit.
+    OPEN: calls are refused until recovery_timeout has passed.
+    HALF_OPEN: one probe call is let through; success closes the circuit,
+    failure re-opens it. A probe that never reports back is replaced after
+    another recovery_timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, fail_threshold: int = 5, recovery_timeout: float = 30):
+        self.name = name
+        self.fail_threshold = fail_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.fail_count = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at < self.recovery_timeout:
+            return False
+        # Let a single probe through; opened_at now marks when it started
+        self.state = self.HALF_OPEN
+        self.opened_at = now
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.fail_count = 0
+
+    def record_failure(self) -> None:
+        self.fail_count += 1
+        if self.state == self.HALF_OPEN or self.fail_count >= self.fail_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    "%s RAG circuit opened after %d failures", self.name, self.fail_count
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+# ============================================================================
+# RAG REQUEST BATCHING
+# ============================================================================
+
+class BulkheadFull(Exception):
+    pass
+
+
+class RagBatcher:
+    """
+    Coalesces questions that arrive close together into one upstream call.
+
+    Callers await submit(); a background task started in the lifespan drains
+    up to max_batch questions (or whatever arrived within max_wait_ms) and
+    sends them as one POST {base_url}/batch_query, expecting
+    {"results": [<same shape as /query>, ...]} in request order. If the
+    backend has no batch endpoint the batch is fanned out as concurrent
+    /query posts on the shared client instead, and later questions skip the
+    queue. With enabled=False every question is posted to /query directly
+    and no background task runs.
+
+    Every upstream call holds one of bulkhead_size slots; calls made outside
+    the batcher (streams, warm-up pings) take one with acquire()/release().
+    A call that cannot get a slot within bulkhead_timeout raises BulkheadFull
+    rather than queueing indefinitely behind a slow backend.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        max_batch: int = 8,
+        max_wait_ms: int = 20,
+        enabled: bool = True,
+        bulkhead_size: int = 20,
+        bulkhead_timeout: float = 5,
+    ):
+        self.name = name
+        self.enabled = enabled
+        self.bulkhead_timeout = bulkhead_timeout
+        self._bulkhead = asyncio.Semaphore(bulkhead_size)
+        # Parsed once so httpx does not re-parse the URL string per request
+        self.query_url = httpx.URL(f"{base_url}/query")
+        self.batch_url = httpx.URL(f"{base_url}/batch_query")
+        self.health_url = httpx.URL(f"{base_url}/health")
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batch_supported = True
+        self._client: Optional[httpx.AsyncClient] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+
+    def start(self, client: httpx.AsyncClient) -> None:
+        self._client = client
+        if not self.enabled:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        while not self._queue.empty():
+            *_, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Server shutting down"))
+        self._task = None
+
+    async def submit(self, question: str, top_k: int) -> RagAnswer:
+        # Queueing only pays off when the backend can take a batch
+        if not self.enabled or not self.batch_supported:
+            return await self._post_one(question, top_k)
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((question, top_k, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch without blocking collection of the next batch
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, int, asyncio.Future]]) -> None:
+        # /batch_query takes a single top_k, so post one batch per distinct value
+        groups: Dict[int, list] = {}
+        for item in batch:
+            groups.setdefault(item[1], []).append(item)
+        await asyncio.gather(
+            *(self._dispatch_group(top_k, items) for top_k, items in groups.items())
+        )
+
+    async def _dispatch_group(
+        self, top_k: int, batch: List[Tuple[str, int, asyncio.Future]]
+    ) -> None:
+        try:
+            results = await self._post([question for question, _, _ in batch], top_k)
+            # A short reply would leave callers waiting on futures forever
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"{self.name} RAG returned {len(results)} results "
+                    f"for {len(batch)} questions"
+                )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def _post(self, questions: List[str], top_k: int) -> list:
+        if len(questions) > 1 and self.batch_supported:
+            response = await self._send(
+                self.batch_url,
+                {"questions": questions, "top_k": top_k}
+            )
+            if response.status_code in (404, 405):
+                logger.info(
+                    "%s RAG has no /batch_query, falling back to concurrent /query",
+                    self.name
+                )
+                self.batch_supported = False
+            else:
+                response.raise_for_status()
+                return _rag_batch_decoder.decode(response.content).results
+
+        return await asyncio.gather(
+            *(self._post_one(question, top_k) for question in questions),
+            return_exceptions=True
+        )
+
+    async def _post_one(self, question: str, top_k: int) -> RagAnswer:
+        response = await self._send(
+            self.query_url,
+            {"question": question, "top_k": top_k}
+        )
+        response.raise_for_status()
+        return _rag_answer_decoder.decode(response.content)
+
+    async def acquire(self) -> None:
+        """Take a bulkhead slot for a call made outside the batcher; pair with release()."""
+        try:
+            await asyncio.wait_for(self._bulkhead.acquire(), self.bulkhead_timeout)
+        except asyncio.TimeoutError:
+            raise BulkheadFull(f"{self.name} RAG has too many requests in flight")
+
+    def release(self) -> None:
+        self._bulkhead.release()
+
+    async def _send(self, url: httpx.URL, payload: dict) -> httpx.Response:
+        await self.acquire()
+        try:
+            return await post_json(self._client, url, payload, self.name)
+        finally:
+            self.release()
+
+
+# ============================================================================
+# IN-FLIGHT DEDUPLICATION
+# ============================================================================
+
+# Lookups currently in progress, so concurrent identical misses share one
+# upstream request instead of each issuing their own
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def single_flight(key: str, fetch):
+    task = _inflight.get(key)
+    if task is None:
+        # The fetch runs as its own task so a caller disconnecting (and being
+        # cancelled) does not cancel the lookup for everyone else waiting on it
+        task = asyncio.create_task(fetch())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
 # ============================================================================
 # INITIALIZE SERVICES
 # ============================================================================
 
-pc = Pinecone(api_key=PINECONE_API_KEY)
-index = pc.Index(PINECONE_INDEX)
+def _load_sme_divesh():
+    # Imported here so torch is only loaded by processes that serve requests,
+    # not by the uvicorn/gunicorn supervisor that imports this module
+    from sentence_transformers import SentenceTransformer
+
+    embed_model = SentenceTransformer("all-mpnet-base-v2")
+    index = Pinecone(api_key=PINECONE_API_KEY).Index(PINECONE_INDEX)
+    return embed_model, index
+
+_batch_options = dict(
+    max_batch=RAG_BATCH_MAX_SIZE,
+    max_wait_ms=RAG_BATCH_MAX_WAIT_MS,
+    enabled=RAG_BATCHING,
+    bulkhead_size=RAG_BULKHEAD_SIZE,
+    bulkhead_timeout=RAG_BULKHEAD_TIMEOUT,
+)
+pest_batcher = RagBatcher("pest", PESTS_DISEASES_RAG_URL, **_batch_options)
+scheme_batcher = RagBatcher("scheme", GOVT_SCHEMES_RAG_URL, **_batch_options)
 
-embed_model = SentenceTransformer("all-mpnet-base-v2")
+# One breaker per upstream, keyed by batcher name
+breakers = {
+    name: CircuitBreaker(name, RAG_BREAKER_THRESHOLD, RAG_BREAKER_RECOVERY)
+    for name in (pest_batcher.name, scheme_batcher.name)
+}
+
+_cache_options = dict(
+    maxsize=RAG_CACHE_MAXSIZE,
+    ttl=RAG_CACHE_TTL,
+    stale_ttl=RAG_CACHE_STALE_TTL,
+)
+pest_cache = TTLCache(**_cache_options)
+scheme_cache = TTLCache(**_cache_options)
+# Keys already include the backend name, so both tools share one Redis cache
+shared_cache = RedisCache(REDIS_URL, ttl=RAG_CACHE_TTL, timeout=REDIS_TIMEOUT)
 
 mcp = FastMCP(name="Alumnx Tools MCP Server")
 
-app = FastAPI(title="Alumnx MCP Server")
+mcp_app = mcp.http_app(stateless_http=True)
+
+
+async def _ping(client: httpx.AsyncClient, batcher: RagBatcher) -> None:
+    try:
+        await batcher.acquire()
+    except BulkheadFull:
+        # A backend this busy already has warm connections
+        return
+    try:
+        await client.get(batcher.health_url, timeout=5)
+    finally:
+        batcher.release()
+
+
+async def _keep_warm(client: httpx.AsyncClient) -> None:
+    # Open the TLS connections before the first user request needs them,
+    # then ping again just before idle keep-alive connections would expire
+    interval = max(RAG_KEEPALIVE_EXPIRY - 5, 5)
+    batchers = (pest_batcher, scheme_batcher)
+    while True:
+        results = await asyncio.gather(
+            *(_ping(client, batcher) for batcher in batchers),
+            return_exceptions=True
+        )
+        for batcher, result in zip(batchers, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Warm-up request to %s failed: %s", batcher.health_url, result
+                )
+        await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # anyio caps worker threads at 40 by default, which would silently bound
+    # concurrent sme_divesh lookups and any sync endpoints
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+    # Loaded per worker at startup rather than at import time
+    app.state.embed_model, app.state.index = await anyio.to_thread.run_sync(
+        _load_sme_divesh
+    )
+
+    # One pooled client per process so RAG calls reuse keep-alive connections
+    # instead of paying a TCP/TLS handshake on every request.
+    app.state.http = httpx.AsyncClient(
+        # Fail fast on a dead backend; only the read phase gets the full budget
+        timeout=httpx.Timeout(
+            connect=RAG_CONNECT_TIMEOUT,
+            read=RAG_READ_TIMEOUT,
+            write=RAG_WRITE_TIMEOUT,
+            pool=RAG_POOL_TIMEOUT,
+        ),
+        # The only retry layer for failed connects; post_json does not retry them
+        transport=httpx.AsyncHTTPTransport(
+            http2=RAG_HTTP2,
+            retries=RAG_CONNECT_RETRIES,
+            limits=httpx.Limits(
+                max_keepalive_connections=RAG_MAX_KEEPALIVE,
+                max_connections=RAG_MAX_CONNECTIONS,
+                keepalive_expiry=RAG_KEEPALIVE_EXPIRY,
+            ),
+        ),
+    )
+    pest_batcher.start(app.state.http)
+    scheme_batcher.start(app.state.http)
+    shared_cache.start()
+    keep_warm = asyncio.create_task(_keep_warm(app.state.http))
+    try:
+        async with mcp_app.lifespan(app):
+            yield
+    finally:
+        keep_warm.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await keep_warm
+        await pest_batcher.stop()
+        await scheme_batcher.stop()
+        await shared_cache.stop()
+        await app.state.http.aclose()
+
+
+def _metrics_app():
+    # Each worker process has its own default registry. In multiprocess mode
+    # workers write to PROMETHEUS_MULTIPROC_DIR and every scrape merges them
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return make_asgi_app()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return make_asgi_app(registry=registry)
 
-app.mount("/mcp", mcp.http_app(stateless_http=True))
+
+app = FastAPI(
+    title="Alumnx MCP Server",
+    lifespan=lifespan,
+)
+
+app.mount("/mcp", mcp_app)
+app.mount("/metrics", _metrics_app())
 
 
 # ============================================================================
 # TOOL IMPLEMENTATIONS
 # ============================================================================
 
-async def query_pest_disease_rag(pest_name: str, crop: str = "General") -> dict:
-    try:
-        async with httpx.AsyncClient(timeout=RAG_TIMEOUT) as client:
-            question_text = (
-                f"{pest_name} affecting {crop} crops"
-                if crop != "General"
-                else pest_name
-            )
+_PEST_TMPL_CROP = "{0} affecting {1} crops".format
+_SCHEME_TMPL_STATE = "tell me the schemes related to {0} in {1}".format
+_SCHEME_TMPL_ALL = "tell me the schemes related to {0}".format
 
-            response = await client.post(
-                f"{PESTS_DISEASES_RAG_URL}/query",
-                json={"question": question_text, "top_k": 5}
-            )
+# Passages the RAG services retrieve per question; fewer means less ranking
+# and a shorter LLM prompt upstream
+RAG_TOP_K = 3
+RAG_TOP_K_MAX = 10
 
-            response.raise_for_status()
-            rag_result = response.json()
 
-            return {
-                "status": "success",
-                "information": rag_result.get("answer"),
-                "sources": rag_result.get("sources", [])
-            }
+def pest_question(pest_name: str, crop: str = "General") -> str:
+    # Blank or default crop means a crop-agnostic question
+    if not crop or crop == "General":
+        return pest_name
+    return _PEST_TMPL_CROP(pest_name, crop)
 
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
 
+def scheme_question(scheme_type: str, state: str = "All India") -> str:
+    if not state or state == "All India":
+        return _SCHEME_TMPL_ALL(scheme_type)
+    return _SCHEME_TMPL_STATE(scheme_type, state)
+
+
+def valid_top_k(top_k: Any) -> bool:
+    return isinstance(top_k, int) and not isinstance(top_k, bool) and 1 <= top_k <= RAG_TOP_K_MAX
+
+
+async def _query_rag(
+    batcher: RagBatcher, cache: TTLCache, question: str, top_k: int, *key_parts: str
+) -> dict:
+    if not valid_top_k(top_k):
+        return {"status": "error", "message": f"top_k must be an integer from 1 to {RAG_TOP_K_MAX}"}
+
+    key = make_key(batcher.name, top_k, *key_parts)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    return await single_flight(
+        key, lambda: _fetch_rag(batcher, cache, question, top_k, key)
+    )
+
+
+def _unavailable(cache: TTLCache, key: str, error: dict) -> dict:
+    # A stale answer beats an error when the backend is degraded
+    stale = cache.get_stale(key)
+    if stale is None:
+        return error
+    return {
+        **stale,
+        "status": "stale",
+        "stale": True,
+        "message": "served from cache; upstream unavailable"
+    }
+
+
+async def _fetch_rag(
+    batcher: RagBatcher, cache: TTLCache, question: str, top_k: int, key: str
+) -> dict:
+    # Another worker (or this one before a restart) may already have the answer
+    shared = await shared_cache.get(key)
+    if shared is not None:
+        result, remaining = shared
+        # Keep the Redis expiry so the local copy does not outlive RAG_CACHE_TTL
+        cache.set(key, result, ttl=remaining)
+        return result
+
+    breaker = breakers[batcher.name]
+    if not breaker.allow():
+        return _unavailable(cache, key, {
+            "status": "error",
+            "message": "RAG service unavailable (circuit open)",
+            "information": None
+        })
 
-async def query_govt_scheme_rag(scheme_type: str, state: str = "All India") -> dict:
     try:
-        async with httpx.AsyncClient(timeout=RAG_TIMEOUT) as client:
-            question_text = (
-                f"tell me the schemes related to {scheme_type} in {state}"
-                if state != "All India"
-                else f"tell me the schemes related to {scheme_type}"
-            )
+        rag_result = await batcher.submit(question, top_k)
+        breaker.record_success()
 
-            response = await client.post(
-                f"{GOVT_SCHEMES_RAG_URL}/query",
-                json={"question": question_text, "top_k": 5}
-            )
+        result = {
+            "status": "success",
+            "information": rag_result.answer,
+            "sources": rag_result.sources
+        }
+        cache.set(key, result)
+        await shared_cache.set(key, result)
+        logger.debug("%s RAG result: %s", batcher.name, result)
+        return result
 
-            response.raise_for_status()
-            rag_result = response.json()
+    except BulkheadFull as e:
+        logger.warning("%s", e)
+        return _unavailable(cache, key, {
+            "status": "error",
+            "message": "RAG service busy, try again shortly"
+        })
+    except httpx.HTTPStatusError as e:
+        logger.warning("%s RAG returned HTTP %d", batcher.name, e.response.status_code)
+        error = {
+            "status": "error",
+            "message": f"RAG service returned HTTP {e.response.status_code}",
+            # Only decode the head of the body; error pages can be large
+            "error_detail": e.response.content[:2048].decode("utf-8", errors="replace")[:500]
+        }
+        # A 4xx means the backend is up and rejected this input
+        if e.response.status_code < 500:
+            breaker.record_success()
+            return error
+        breaker.record_failure()
+        return _unavailable(cache, key, error)
+    except httpx.TimeoutException:
+        breaker.record_failure()
+        logger.warning("%s RAG timed out", batcher.name)
+        return _unavailable(cache, key, {
+            "status": "error",
+            "message": "RAG service timed out"
+        })
+    except httpx.HTTPError as e:
+        breaker.record_failure()
+        logger.warning("%s RAG unreachable: %s", batcher.name, e)
+        return _unavailable(cache, key, {
+            "status": "error",
+            "message": f"RAG service unreachable: {e}"
+        })
+    except (msgspec.DecodeError, ValueError) as e:
+        # Upstream answered 2xx with a body that is not the expected shape
+        breaker.record_success()
+        logger.warning("%s RAG returned an unreadable reply: %s", batcher.name, e)
+        return {"status": "error", "message": f"Invalid RAG response: {e}"}
 
-            return {
-                "status": "success",
-                "information": rag_result.get("answer"),
-                "sources": rag_result.get("sources", [])
-            }
 
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
+async def query_pest_disease_rag(
+    pest_name: str, crop: str = "General", top_k: int = RAG_TOP_K
+) -> dict:
+    return await _query_rag(
+        pest_batcher, pest_cache, pest_question(pest_name, crop), top_k, pest_name, crop
+    )
+
+
+async def query_govt_scheme_rag(
+    scheme_type: str, state: str = "All India", top_k: int = RAG_TOP_K
+) -> dict:
+    return await _query_rag(
+        scheme_batcher, scheme_cache, scheme_question(scheme_type, state), top_k,
+        scheme_type, state
+    )
+
+
+def _search_sme_divesh(query: str, top_k: int):
+    query_embedding = app.state.embed_model.encode(query).tolist()
+
+    return app.state.index.query(
+        vector=query_embedding,
+        top_k=top_k,
+        include_metadata=True,
+        namespace="sme-Divesh"
+    )
 
 
 async def query_sme_divesh(query: str, top_k: int = 5) -> dict:
     try:
-        query_embedding = embed_model.encode(query).tolist()
-
-        results = index.query(
-            vector=query_embedding,
-            top_k=top_k,
-            include_metadata=True,
-            namespace="sme-Divesh"
-        )
+        # Embedding and the Pinecone client are blocking; keep them off the loop
+        results = await anyio.to_thread.run_sync(_search_sme_divesh, query, top_k)
 
         matches = [
             {
@@ -145,21 +788,67 @@ async def query_sme_divesh(query: str, top_k: int = 5) -> dict:
         }
 
     except Exception as e:
+        logger.exception("sme_divesh search failed")
         return {"status": "error", "message": str(e)}
 
 
+async def query_agri_combined(
+    pest_name: Optional[str] = None,
+    crop: str = "General",
+    scheme_type: Optional[str] = None,
+    state: str = "All India",
+    top_k: int = RAG_TOP_K,
+) -> dict:
+    lookups = {}
+    if pest_name:
+        lookups["pests_and_diseases"] = query_pest_disease_rag(pest_name, crop, top_k)
+    if scheme_type:
+        lookups["govt_schemes"] = query_govt_scheme_rag(scheme_type, state, top_k)
+
+    if not lookups:
+        return {"status": "error", "message": "Provide pest_name and/or scheme_type"}
+
+    # Both backends are independent, so the combined call costs the slower one
+    results = await asyncio.gather(*lookups.values(), return_exceptions=True)
+    results = {
+        name: (
+            {"status": "error", "message": str(result)}
+            if isinstance(result, BaseException)
+            else result
+        )
+        for name, result in zip(lookups, results)
+    }
+
+    failed = sum(result.get("status") == "error" for result in results.values())
+    if failed == len(results):
+        status = "error"
+    elif failed:
+        status = "partial"
+    else:
+        status = "success"
+    return {"status": status, "results": results}
+
+
 # ============================================================================
 # MCP TOOL REGISTRATION
 # ============================================================================
 
+# Bounds are declared so they appear in the generated MCP input schema
+TopK = Annotated[int, Field(ge=1, le=RAG_TOP_K_MAX)]
+
+
 @mcp.tool()
-async def pests_and_diseases(pest_name: str, crop: str = "General") -> dict:
-    return await query_pest_disease_rag(pest_name, crop)
+async def pests_and_diseases(
+    pest_name: str, crop: str = "General", top_k: TopK = RAG_TOP_K
+) -> dict:
+    return await query_pest_disease_rag(pest_name, crop, top_k)
 
 
 @mcp.tool()
-async def govt_schemes(scheme_type: str, state: str = "All India") -> dict:
-    return await query_govt_scheme_rag(scheme_type, state)
+async def govt_schemes(
+    scheme_type: str, state: str = "All India", top_k: TopK = RAG_TOP_K
+) -> dict:
+    return await query_govt_scheme_rag(scheme_type, state, top_k)
 
 
 @mcp.tool()
@@ -167,75 +856,289 @@ async def sme_divesh(query: str, top_k: int = 5) -> dict:
     return await query_sme_divesh(query, top_k)
 
 
+@mcp.tool()
+async def agri_combined(
+    pest_name: Optional[str] = None,
+    crop: str = "General",
+    scheme_type: Optional[str] = None,
+    state: str = "All India",
+    top_k: TopK = RAG_TOP_K,
+) -> dict:
+    return await query_agri_combined(pest_name, crop, scheme_type, state, top_k)
+
+
 # ============================================================================
 # REST TOOL CALL SUPPORT
 # ============================================================================
 
-class ToolCallRequest(BaseModel):
+class ToolCallRequest(msgspec.Struct):
     name: str
     arguments: Dict[str, Any]
 
 
-@app.post("/callTool")
-async def call_tool(request: ToolCallRequest):
+MSGPACK = "application/msgpack"
+
+
+def _encode_result(request: Request, payload: dict):
+    # Clients that send Accept: application/msgpack get the smaller binary
+    # encoding; everyone else gets the response_model JSON path
+    if MSGPACK in request.headers.get("accept", ""):
+        return Response(content=msgspec.msgpack.encode(payload), media_type=MSGPACK)
+    return payload
+
+
+def _decode_body(type_):
+    # msgspec decodes and validates the body in one C pass, cheaper than
+    # building a Pydantic model for this two-field envelope. The Decoder is
+    # built once so the type is not re-inspected on every request.
+    decoder = msgspec.json.Decoder(type_)
+    msgpack_decoder = msgspec.msgpack.Decoder(type_)
+
+    async def decode(request: Request):
+        body = await request.body()
+        try:
+            if MSGPACK in request.headers.get("content-type", ""):
+                return msgpack_decoder.decode(body)
+            return decoder.decode(body)
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    return decode
 
-    if request.name == "pests_and_diseases":
-        return {"result": await query_pest_disease_rag(
-            request.arguments.get("pest_name"),
-            request.arguments.get("crop", "General")
-        )}
 
-    if request.name == "govt_schemes":
-        return {"result": await query_govt_scheme_rag(
-            request.arguments.get("scheme_type"),
-            request.arguments.get("state", "All India")
-        )}
+decode_tool_call = _decode_body(ToolCallRequest)
+decode_tool_calls = _decode_body(List[ToolCallRequest])
 
-    if request.name == "sme_divesh":
-        return {"result": await query_sme_divesh(
-            request.arguments.get("query"),
-            request.arguments.get("top_k", 5)
-        )}
 
-    raise HTTPException(status_code=404, detail="Unknown tool")
+def _openapi_body(schema: dict) -> dict:
+    # Bodies are read by the msgspec dependencies above, so describe them
+    # for /docs explicitly
+    return {"requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": schema},
+            MSGPACK: {"schema": schema},
+        },
+    }}
+
+
+_TOOL_CALL_SCHEMA = msgspec.json.schema_components([ToolCallRequest])[1]["ToolCallRequest"]
+TOOL_CALL_BODY = _openapi_body(_TOOL_CALL_SCHEMA)
+TOOL_CALLS_BODY = _openapi_body({"type": "array", "items": _TOOL_CALL_SCHEMA})
+
+
+TOOL_DISPATCH = {
+    "pests_and_diseases": query_pest_disease_rag,
+    "govt_schemes": query_govt_scheme_rag,
+    "sme_divesh": query_sme_divesh,
+    "agri_combined": query_agri_combined,
+}
+
+
+async def dispatch_tool(name: str, arguments: Dict[str, Any]) -> dict:
+    fn = TOOL_DISPATCH.get(name)
+    if fn is None:
+        raise HTTPException(status_code=404, detail=f"Unknown tool: {name}")
+
+    try:
+        pending = fn(**arguments)
+    except TypeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return await pending
+
+
+# A response_model lets FastAPI serialize straight to JSON bytes via Pydantic
+@app.post("/callTool", response_model=Dict[str, Any], openapi_extra=TOOL_CALL_BODY)
+async def call_tool(raw: Request, request: ToolCallRequest = Depends(decode_tool_call)):
+    return _encode_result(
+        raw, {"result": await dispatch_tool(request.name, request.arguments)}
+    )
+
+
+def _error_result(error: BaseException) -> dict:
+    message = error.detail if isinstance(error, HTTPException) else str(error)
+    return {"status": "error", "message": message}
+
+
+@app.post("/callToolsBatch", response_model=Dict[str, Any], openapi_extra=TOOL_CALLS_BODY)
+async def call_tools_batch(
+    raw: Request, requests: List[ToolCallRequest] = Depends(decode_tool_calls)
+):
+    # Independent tool calls run concurrently; wall time is the slowest call
+    results = await asyncio.gather(
+        *(dispatch_tool(call.name, call.arguments) for call in requests),
+        return_exceptions=True
+    )
+    return _encode_result(raw, {"results": [
+        _error_result(result) if isinstance(result, BaseException) else result
+        for result in results
+    ]})
+
+
+# RAG-backed tools whose upstream reply can be proxied byte-for-byte
+STREAM_DISPATCH = {
+    "pests_and_diseases": (pest_batcher, pest_question),
+    "govt_schemes": (scheme_batcher, scheme_question),
+}
+
+
+@app.post("/callTool/stream", openapi_extra=TOOL_CALL_BODY)
+async def call_tool_stream(request: ToolCallRequest = Depends(decode_tool_call)):
+    route = STREAM_DISPATCH.get(request.name)
+    if route is None:
+        raise HTTPException(status_code=404, detail="Unknown streaming tool")
+    batcher, build_question = route
+
+    arguments = dict(request.arguments)
+    top_k = arguments.pop("top_k", RAG_TOP_K)
+    if not valid_top_k(top_k):
+        raise HTTPException(
+            status_code=422, detail=f"top_k must be an integer from 1 to {RAG_TOP_K_MAX}"
+        )
+    try:
+        question_text = build_question(**arguments)
+    except TypeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    breaker = breakers[batcher.name]
+    if not breaker.allow():
+        raise HTTPException(status_code=503, detail="RAG service unavailable (circuit open)")
+
+    # The slot is held until the stream is closed, not just until headers arrive
+    try:
+        await batcher.acquire()
+    except BulkheadFull:
+        raise HTTPException(status_code=503, detail="RAG service busy, try again shortly")
+
+    client = app.state.http
+    upstream_request = client.build_request(
+        "POST",
+        batcher.query_url,
+        content=orjson.dumps({"question": question_text, "top_k": top_k}),
+        headers=_JSON_HEADERS
+    )
+
+    try:
+        upstream = await client.send(upstream_request, stream=True)
+    except httpx.TimeoutException:
+        batcher.release()
+        breaker.record_failure()
+        raise HTTPException(status_code=504, detail="RAG service timed out")
+    except httpx.HTTPError as e:
+        batcher.release()
+        breaker.record_failure()
+        raise HTTPException(status_code=502, detail=f"RAG service unreachable: {e}")
+    except BaseException:
+        batcher.release()
+        raise
+
+    if upstream.is_error:
+        await upstream.aclose()
+        batcher.release()
+        # A 4xx means the backend is up and rejected this input
+        if upstream.status_code < 500:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        raise HTTPException(
+            status_code=502,
+            detail=f"RAG service returned HTTP {upstream.status_code}"
+        )
+    breaker.record_success()
+
+    async def relay():
+        # StreamingResponse skips background tasks when the body iterator
+        # raises, so the upstream close and slot release live here instead
+        try:
+            async for chunk in upstream.aiter_bytes():
+                yield chunk
+        except httpx.HTTPError:
+            breaker.record_failure()
+            logger.warning("%s RAG stream failed mid-response", batcher.name)
+            raise
+        finally:
+            try:
+                await upstream.aclose()
+            finally:
+                batcher.release()
+
+    # Forward chunks as they arrive instead of parsing and re-encoding the
+    # body; keep the upstream media type so SSE / NDJSON answers pass through
+    return StreamingResponse(
+        relay(),
+        media_type=upstream.headers.get("content-type", "application/json"),
+        headers={"cache-control": "no-cache"}
+    )
 
 
 @app.get("/health")
-async def health():
+async def health() -> Dict[str, str]:
     return {"status": "healthy"}
 
 
-@app.get("/list-tools")
-async def list_tools():
-    return {
-        "server": "Alumnx Tools MCP Server",
-        "tools": [
-            {
-                "name": "pests_and_diseases",
-                "description": "Query the RAG system for information about pests and diseases affecting crops.",
-                "parameters": {
-                    "pest_name": {"type": "string", "required": True, "description": "Name of the pest or disease to look up."},
-                    "crop": {"type": "string", "required": False, "default": "General", "description": "Crop affected by the pest or disease."}
-                }
-            },
-            {
-                "name": "govt_schemes",
-                "description": "Query the RAG system for information about government schemes related to agriculture.",
-                "parameters": {
-                    "scheme_type": {"type": "string", "required": True, "description": "Type or topic of the government scheme."},
-                    "state": {"type": "string", "required": False, "default": "All India", "description": "State for which to retrieve schemes."}
-                }
-            },
-            {
-                "name": "sme_divesh",
-                "description": "Retrieve relevant knowledge chunks from the SME-Divesh namespace in Pinecone via semantic search.",
-                "parameters": {
-                    "query": {"type": "string", "required": True, "description": "The search query."},
-                    "top_k": {"type": "integer", "required": False, "default": 5, "description": "Number of top results to return."}
-                }
+# Static tool schema, serialized once at import instead of per request
+TOOLS_LIST = {
+    "server": "Alumnx Tools MCP Server",
+    "tools": [
+        {
+            "name": "pests_and_diseases",
+            "description": "Query the RAG system for information about pests and diseases affecting crops.",
+            "parameters": {
+                "pest_name": {"type": "string", "required": True, "description": "Name of the pest or disease to look up."},
+                "crop": {"type": "string", "required": False, "default": "General", "description": "Crop affected by the pest or disease."},
+                "top_k": {"type": "integer", "required": False, "default": RAG_TOP_K, "minimum": 1, "maximum": RAG_TOP_K_MAX, "description": "Passages the RAG service retrieves; lower is faster, higher is more thorough."}
             }
-        ]
-    }
+        },
+        {
+            "name": "govt_schemes",
+            "description": "Query the RAG system for information about government schemes related to agriculture.",
+            "parameters": {
+                "scheme_type": {"type": "string", "required": True, "description": "Type or topic of the government scheme."},
+                "state": {"type": "string", "required": False, "default": "All India", "description": "State for which to retrieve schemes."},
+                "top_k": {"type": "integer", "required": False, "default": RAG_TOP_K, "minimum": 1, "maximum": RAG_TOP_K_MAX, "description": "Passages the RAG service retrieves; lower is faster, higher is more thorough."}
+            }
+        },
+        {
+            "name": "sme_divesh",
+            "description": "Retrieve relevant knowledge chunks from the SME-Divesh namespace in Pinecone via semantic search.",
+            "parameters": {
+                "query": {"type": "string", "required": True, "description": "The search query."},
+                "top_k": {"type": "integer", "required": False, "default": 5, "description": "Number of top results to return."}
+            }
+        },
+        {
+            "name": "agri_combined",
+            "description": "Look up pest/disease information and government schemes in one call; both RAG queries run concurrently.",
+            "parameters": {
+                "pest_name": {"type": "string", "required": False, "description": "Name of the pest or disease to look up."},
+                "crop": {"type": "string", "required": False, "default": "General", "description": "Crop affected by the pest or disease."},
+                "scheme_type": {"type": "string", "required": False, "description": "Type or topic of the government scheme."},
+                "state": {"type": "string", "required": False, "default": "All India", "description": "State for which to retrieve schemes."},
+                "top_k": {"type": "integer", "required": False, "default": RAG_TOP_K, "minimum": 1, "maximum": RAG_TOP_K_MAX, "description": "Passages the RAG service retrieves; lower is faster, higher is more thorough."}
+            }
+        }
+    ]
+}
+
+_TOOLS_LIST_BYTES = orjson.dumps(TOOLS_LIST)
+
+# The schema only changes on deploy, so discovery clients that poll can
+# cache it and revalidate cheaply with If-None-Match
+_TOOLS_LIST_HEADERS = {
+    "cache-control": "public, max-age=300",
+    "etag": f'"{hashlib.sha256(_TOOLS_LIST_BYTES).hexdigest()[:16]}"',
+}
+
+
+@app.get("/list-tools")
+async def list_tools(request: Request):
+    if request.headers.get("if-none-match") == _TOOLS_LIST_HEADERS["etag"]:
+        return Response(status_code=304, headers=_TOOLS_LIST_HEADERS)
+    return Response(
+        content=_TOOLS_LIST_BYTES,
+        media_type="application/json",
+        headers=_TOOLS_LIST_HEADERS
+    )
 
 
 # ============================================================================
@@ -243,4 +1146,18 @@ async def list_tools():
 # ============================================================================
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=9000)
\ No newline at end of file
+    # Each worker holds its own copy of the embedding model, so keep the
+    # default small; gunicorn.conf.py scales to the core count instead
+    workers = int(os.getenv("WORKERS") or os.getenv("WEB_CONCURRENCY") or 2)
+    uvicorn.run(
+        # uvicorn needs an import string to spawn workers, but with a single
+        # worker it would re-import this module in-process and register the
+        # Prometheus metrics twice, so pass the app object instead
+        app if workers == 1 else "mcp_server:app",
+        host="0.0.0.0",
+        port=9000,
+        workers=workers,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        log_level=LOG_LEVEL.lower(),
+    )
\ No newline at end of file
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# mcp_server validates these at import time
+os.environ.setdefault("PESTS_DISEASES_RAG_URL", "http://pest.test")
+os.environ.setdefault("GOVT_SCHEMES_RAG_URL", "http://scheme.test")
+os.environ.setdefault("PINECONE_API_KEY", "test-key")
+os.environ.setdefault("PINECONE_INDEX", "test-index")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+import orjson
+
+import mcp_server
+from mcp_server import RagBatcher
+
+
+def _batcher() -> RagBatcher:
+    return RagBatcher("pest", "http://pest.test", max_batch=8, max_wait_ms=10)
+
+
+def _fake_post_json(reply: dict):
+    async def post_json(client, url, payload, backend):
+        return httpx.Response(
+            200, content=orjson.dumps(reply), request=httpx.Request("POST", url)
+        )
+    return post_json
+
+
+async def _submit_all(batcher: RagBatcher, questions):
+    batcher.start(None)
+    try:
+        return await asyncio.wait_for(
+            asyncio.gather(
+                *(batcher.submit(question, 3) for question in questions),
+                return_exceptions=True
+            ),
+            timeout=2
+        )
+    finally:
+        await batcher.stop()
+
+
+def test_batch_results_are_returned_in_order(monkeypatch):
+    monkeypatch.setattr(mcp_server, "post_json", _fake_post_json({
+        "results": [{"answer": "a1"}, {"answer": "a2"}]
+    }))
+
+    results = asyncio.run(_submit_all(_batcher(), ["q1", "q2"]))
+
+    assert [result.answer for result in results] == ["a1", "a2"]
+
+
+def test_short_batch_reply_fails_every_caller(monkeypatch):
+    monkeypatch.setattr(mcp_server, "post_json", _fake_post_json({
+        "results": [{"answer": "a1"}]
+    }))
+
+    results = asyncio.run(_submit_all(_batcher(), ["q1", "q2", "q3"]))
+
+    assert len(results) == 3
+    for result in results:
+        assert isinstance(result, ValueError)
+        assert "1 results for 3 questions" in str(result)
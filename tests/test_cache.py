@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import orjson
+
+import cache
+from cache import RedisCache, TTLCache, make_key
+
+
+def test_get_returns_fresh_entries_only():
+    ttl_cache = TTLCache(ttl=-1, stale_ttl=60)
+    ttl_cache.set("k", "v")
+
+    assert ttl_cache.get("k") is None
+    assert ttl_cache.get_stale("k") == "v"
+
+
+def test_entries_expire_after_the_stale_window():
+    ttl_cache = TTLCache(ttl=0.01, stale_ttl=0.01)
+    ttl_cache.set("k", "v")
+    assert ttl_cache.get("k") == "v"
+
+    time.sleep(0.03)
+
+    assert ttl_cache.get_stale("k") is None
+
+
+def test_per_entry_ttl_overrides_the_default():
+    ttl_cache = TTLCache(ttl=3600)
+    ttl_cache.set("k", "v", ttl=0.01)
+
+    time.sleep(0.02)
+
+    assert ttl_cache.get("k") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    ttl_cache = TTLCache(maxsize=2)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.get("a")
+    ttl_cache.set("c", 3)
+
+    assert ttl_cache.get("a") == 1
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("c") == 3
+
+
+def test_make_key_normalizes_arguments():
+    assert make_key("pest", " Aphids ", "Wheat") == make_key("pest", "aphids", "wheat")
+    assert make_key("pest", "aphids", 3) != make_key("pest", "aphids", 5)
+
+
+class _FakePipeline:
+    def __init__(self, store):
+        self._store = store
+        self._ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get(self, key):
+        self._ops.append(lambda: self._store.get(key, (None, -2))[0])
+        return self
+
+    def pttl(self, key):
+        self._ops.append(lambda: self._store.get(key, (None, -2))[1])
+        return self
+
+    async def execute(self):
+        return [op() for op in self._ops]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self.store)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = (value, ttl * 1000)
+
+
+def _redis_cache() -> RedisCache:
+    redis_cache = RedisCache("redis://cache.test", ttl=600)
+    redis_cache._client = _FakeRedis()
+    return redis_cache
+
+
+def test_redis_get_returns_value_and_remaining_ttl():
+    redis_cache = _redis_cache()
+    redis_cache._client.store["agrigpt:rag:k"] = (orjson.dumps({"a": 1}), 1500)
+
+    assert asyncio.run(redis_cache.get("k")) == ({"a": 1}, 1.5)
+
+
+def test_redis_set_then_get_round_trips():
+    redis_cache = _redis_cache()
+
+    async def run():
+        await redis_cache.set("k", {"a": 1})
+        return await redis_cache.get("k")
+
+    assert asyncio.run(run()) == ({"a": 1}, 600)
+
+
+def test_redis_miss_and_disabled_cache_return_none():
+    assert asyncio.run(_redis_cache().get("missing")) is None
+    assert asyncio.run(RedisCache().get("k")) is None
+
+
+def test_redis_errors_are_treated_as_misses():
+    redis_cache = _redis_cache()
+
+    def broken_pipeline(transaction=True):
+        raise cache.aioredis.ConnectionError("down")
+
+    redis_cache._client.pipeline = broken_pipeline
+
+    assert asyncio.run(redis_cache.get("k")) is None
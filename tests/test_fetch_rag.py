@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+import mcp_server
+from cache import TTLCache
+from mcp_server import CircuitBreaker, RagAnswer, _fetch_rag
+
+CACHED = {"status": "success", "information": "old answer", "sources": []}
+
+
+class _Batcher:
+    name = "pest"
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    async def submit(self, question, top_k):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+def _status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://pest.test/query")
+    response = httpx.Response(code, content=b"upstream error", request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker("pest", fail_threshold=5)
+    monkeypatch.setitem(mcp_server.breakers, "pest", breaker)
+    return breaker
+
+
+def _expired_cache() -> TTLCache:
+    # ttl=-1 makes every entry stale as soon as it is written
+    stale_cache = TTLCache(ttl=-1, stale_ttl=3600)
+    stale_cache.set("k", CACHED)
+    return stale_cache
+
+
+def _fetch(outcome, rag_cache: TTLCache) -> dict:
+    return asyncio.run(_fetch_rag(_Batcher(outcome), rag_cache, "q", 3, "k"))
+
+
+@pytest.mark.parametrize("error", [_status_error(503), httpx.ReadTimeout("slow")])
+def test_upstream_failure_serves_the_stale_answer(breaker, error):
+    result = _fetch(error, _expired_cache())
+
+    assert result["status"] == "stale"
+    assert result["stale"] is True
+    assert result["information"] == "old answer"
+    assert breaker.fail_count == 1
+
+
+def test_open_circuit_serves_the_stale_answer(breaker):
+    breaker.state = CircuitBreaker.OPEN
+    breaker.opened_at = float("inf")
+
+    result = _fetch(RagAnswer(answer="new answer"), _expired_cache())
+
+    assert result["status"] == "stale"
+    assert result["information"] == "old answer"
+
+
+def test_upstream_failure_without_cache_is_an_error(breaker):
+    result = _fetch(_status_error(503), TTLCache())
+
+    assert result["status"] == "error"
+    assert result["error_detail"] == "upstream error"
+
+
+def test_client_error_is_not_served_stale(breaker):
+    result = _fetch(_status_error(400), _expired_cache())
+
+    assert result["status"] == "error"
+    assert breaker.fail_count == 0
+
+
+def test_success_is_cached(breaker):
+    rag_cache = TTLCache()
+
+    result = _fetch(RagAnswer(answer="new answer", sources=["s"]), rag_cache)
+
+    assert result == {"status": "success", "information": "new answer", "sources": ["s"]}
+    assert rag_cache.get("k") == result
@@ -0,0 +1,93 @@
+import asyncio
+
+import httpx
+
+import mcp_server
+from mcp_server import RAG_MAX_RETRIES, RAG_RETRY_MAX_DELAY, _retry_delay, post_json
+
+URL = httpx.URL("http://pest.test/query")
+
+
+def _call(monkeypatch, replies):
+    """Run post_json against a backend that answers with replies in order."""
+    calls = []
+    delays = []
+
+    def handler(request):
+        calls.append(request)
+        reply = replies[min(len(calls), len(replies)) - 1]
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def no_wait(attempt, retry_after=None):
+        delays.append(retry_after)
+        return 0
+
+    monkeypatch.setattr(mcp_server, "_retry_delay", no_wait)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            try:
+                return await post_json(client, URL, {"question": "q"}, "pest")
+            except httpx.HTTPError as e:
+                return e
+
+    return asyncio.run(run()), calls, delays
+
+
+def test_retries_retryable_status_until_success(monkeypatch):
+    result, calls, _ = _call(monkeypatch, [
+        httpx.Response(503), httpx.Response(429), httpx.Response(200, json={})
+    ])
+
+    assert result.status_code == 200
+    assert len(calls) == 3
+
+
+def test_returns_last_retryable_status_when_retries_run_out(monkeypatch):
+    result, calls, _ = _call(monkeypatch, [httpx.Response(502)])
+
+    assert result.status_code == 502
+    assert len(calls) == RAG_MAX_RETRIES + 1
+
+
+def test_retries_read_errors(monkeypatch):
+    result, calls, _ = _call(monkeypatch, [
+        httpx.ReadError("reset"), httpx.Response(200, json={})
+    ])
+
+    assert result.status_code == 200
+    assert len(calls) == 2
+
+
+def test_passes_retry_after_to_the_backoff(monkeypatch):
+    _, _, delays = _call(monkeypatch, [
+        httpx.Response(429, headers={"retry-after": "3"}), httpx.Response(200, json={})
+    ])
+
+    assert delays == ["3"]
+
+
+def test_does_not_retry_connect_errors(monkeypatch):
+    result, calls, _ = _call(monkeypatch, [httpx.ConnectError("refused")])
+
+    assert isinstance(result, httpx.ConnectError)
+    assert len(calls) == 1
+
+
+def test_does_not_retry_client_errors(monkeypatch):
+    result, calls, _ = _call(monkeypatch, [httpx.Response(400)])
+
+    assert result.status_code == 400
+    assert len(calls) == 1
+
+
+def test_retry_delay_honours_retry_after():
+    assert _retry_delay(0, "3") == 3
+    assert _retry_delay(0, "3600") == RAG_RETRY_MAX_DELAY
+
+
+def test_retry_delay_backs_off_with_jitter():
+    for attempt in range(5):
+        assert 0 <= _retry_delay(attempt) <= RAG_RETRY_MAX_DELAY
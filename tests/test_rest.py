@@ -0,0 +1,61 @@
+import asyncio
+import warnings
+
+import httpx
+import msgspec
+
+import mcp_server
+from mcp_server import MSGPACK, app
+
+RESULT = {"status": "success", "information": "answer", "sources": ["s"]}
+
+
+async def _fake_tool(**arguments):
+    return {**RESULT, "arguments": arguments}
+
+
+def _post(path: str, body, accept: str = "application/json") -> httpx.Response:
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://server") as client:
+            return await client.post(path, json=body, headers={"accept": accept})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        return asyncio.run(run())
+
+
+def test_call_tool_returns_json(monkeypatch):
+    monkeypatch.setitem(mcp_server.TOOL_DISPATCH, "pests_and_diseases", _fake_tool)
+
+    response = _post("/callTool", {
+        "name": "pests_and_diseases", "arguments": {"pest_name": "aphids"}
+    })
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"result": {**RESULT, "arguments": {"pest_name": "aphids"}}}
+
+
+def test_call_tool_negotiates_msgpack(monkeypatch):
+    monkeypatch.setitem(mcp_server.TOOL_DISPATCH, "pests_and_diseases", _fake_tool)
+
+    response = _post(
+        "/callTool", {"name": "pests_and_diseases", "arguments": {}}, accept=MSGPACK
+    )
+
+    assert response.headers["content-type"] == MSGPACK
+    assert msgspec.msgpack.decode(response.content) == {"result": {**RESULT, "arguments": {}}}
+
+
+def test_batch_reports_failures_in_place(monkeypatch):
+    monkeypatch.setitem(mcp_server.TOOL_DISPATCH, "pests_and_diseases", _fake_tool)
+
+    response = _post("/callToolsBatch", [
+        {"name": "pests_and_diseases", "arguments": {}},
+        {"name": "no_such_tool", "arguments": {}},
+    ])
+
+    results = response.json()["results"]
+    assert results[0]["status"] == "success"
+    assert results[1] == {"status": "error", "message": "Unknown tool: no_such_tool"}
@@ -0,0 +1,44 @@
+import asyncio
+import contextlib
+
+import httpx
+
+import mcp_server
+from mcp_server import CircuitBreaker, app, pest_batcher
+
+
+class _FailingStream(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b'{"answer": "'
+        raise httpx.ReadTimeout("upstream stalled")
+
+
+def _upstream(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200, headers={"content-type": "application/json"}, stream=_FailingStream()
+    )
+
+
+async def _stream_call() -> None:
+    app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(_upstream))
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://server") as client:
+            with contextlib.suppress(httpx.HTTPError):
+                await client.post("/callTool/stream", json={
+                    "name": "pests_and_diseases",
+                    "arguments": {"pest_name": "aphids"}
+                })
+    finally:
+        await app.state.http.aclose()
+
+
+def test_failed_stream_releases_its_slot(monkeypatch):
+    breaker = CircuitBreaker("pest", fail_threshold=5)
+    monkeypatch.setitem(mcp_server.breakers, "pest", breaker)
+    slots = pest_batcher._bulkhead._value
+
+    asyncio.run(_stream_call())
+
+    assert pest_batcher._bulkhead._value == slots
+    assert breaker.fail_count == 1